@@ -61,7 +61,8 @@ class BlackScholesCalculator:
     def price(params: OptionParams, option_type: OptionType) -> float:
         """Calculate option price using Black-Scholes formula"""
         d1 = BlackScholesCalculator.d1(params)
-        d2 = BlackScholesCalculator.d2(params)
+        # Same as d2(params), without recomputing d1
+        d2 = d1 - params.volatility * math.sqrt(params.time_to_expiry)
         s, k, t, r, q = params.spot, params.strike, params.time_to_expiry, params.risk_free_rate, params.dividend_yield
         
         if option_type == OptionType.CALL:
@@ -125,7 +126,8 @@ class BlackScholesCalculator:
     def theta(params: OptionParams, option_type: OptionType) -> float:
         """Calculate option Theta (time decay)"""
         d1 = BlackScholesCalculator.d1(params)
-        d2 = BlackScholesCalculator.d2(params)
+        # Same as d2(params), without recomputing d1
+        d2 = d1 - params.volatility * math.sqrt(params.time_to_expiry)
         s, k, t, r, q, sigma = params.spot, params.strike, params.time_to_expiry, params.risk_free_rate, params.dividend_yield, params.volatility
         
         term1 = -s * math.exp(-q * t) * BlackScholesCalculator._n(d1) * sigma / (2 * math.sqrt(t))
@@ -16,6 +16,7 @@ Author: SIMM Validation Team
 """
 
 import math
+from collections import defaultdict
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, field
 from enum import Enum
@@ -97,10 +98,20 @@ class SimmChallengerModel:
         '15Y': 0.1110, '20Y': 0.1142, '30Y': 0.1174
     }
     
+    # IR risk weight table per volatility group
+    IR_RISK_WEIGHTS_BY_GROUP = {
+        'low': IR_RISK_WEIGHTS_LOW,
+        'high': IR_RISK_WEIGHTS_HIGH,
+        'regular': IR_RISK_WEIGHTS_REGULAR
+    }
+    
     # FX Risk Weights (Section I.1)
     FX_RW_REGULAR = 0.071  # 7.1%
     FX_RW_HIGH_VOL = 0.180  # 18.0%
     
+    # Low volatility currencies (Table 2)
+    LOW_VOL_CURRENCIES = ['JPY']
+    
     # High volatility currencies (Section I.1)
     HIGH_VOL_CURRENCIES = ['ARS', 'EGP', 'ETB', 'GHS', 'LBP', 'NGN', 'RUB', 'SCR', 'VES', 'ZMW']
     
@@ -134,13 +145,18 @@ class SimmChallengerModel:
         RiskClass.COMMODITY: 3e9
     }
     
-    def __init__(self):
+    def __init__(self, keep_log: bool = True):
+        """
+        Args:
+            keep_log: Record per-step WS/K audit entries in calculation_log.
+                      Disable for bulk runs that never read the drill-down.
+        """
+        self.keep_log = keep_log
         self.calculation_log = []
     
     def _get_ir_volatility_group(self, currency: str) -> str:
         """Determine IR volatility group for currency"""
-        low_vol = ['JPY']
-        if currency in low_vol:
+        if currency in self.LOW_VOL_CURRENCIES:
             return 'low'
         elif currency in self.HIGH_VOL_CURRENCIES:
             return 'high'
@@ -149,15 +165,7 @@ class SimmChallengerModel:
     
     def _get_ir_risk_weight(self, tenor: str, currency: str) -> float:
         """Get appropriate IR risk weight based on currency volatility"""
-        group = self._get_ir_volatility_group(currency)
-        
-        if group == 'low':
-            rw_dict = self.IR_RISK_WEIGHTS_LOW
-        elif group == 'high':
-            rw_dict = self.IR_RISK_WEIGHTS_HIGH
-        else:
-            rw_dict = self.IR_RISK_WEIGHTS_REGULAR
-        
+        rw_dict = self.IR_RISK_WEIGHTS_BY_GROUP[self._get_ir_volatility_group(currency)]
         return rw_dict.get(tenor, 0.0441)  # Default to 5Y
     
     def _calculate_concentration_risk(self, sensitivities: List[Sensitivity], 
@@ -170,15 +178,12 @@ class SimmChallengerModel:
         cr_factors = {}
         threshold = self.CONCENTRATION_THRESHOLDS.get(risk_class, 1e9)
         
-        # Group by bucket
-        bucket_sens = {}
+        # Accumulate |delta| per bucket in a single pass
+        bucket_sums = defaultdict(float)
         for sens in sensitivities:
-            if sens.bucket not in bucket_sens:
-                bucket_sens[sens.bucket] = []
-            bucket_sens[sens.bucket].append(sens)
+            bucket_sums[sens.bucket] += abs(sens.delta)
         
-        for bucket, bucket_sens_list in bucket_sens.items():
-            sum_ws = sum(abs(s.delta) for s in bucket_sens_list)
+        for bucket, sum_ws in bucket_sums.items():
             cr = max(1.0, math.sqrt(sum_ws / threshold)) if sum_ws > 0 else 1.0
             cr_factors[bucket] = cr
         
@@ -198,9 +203,11 @@ class SimmChallengerModel:
         """
         ws = {}
         cr_factors = self._calculate_concentration_risk(sensitivities, risk_class)
+        log_append = self.calculation_log.append if self.keep_log else None
         
         for sens in sensitivities:
             bucket = sens.bucket
+            delta = sens.delta
             
             # Get risk weight
             if risk_class == RiskClass.INTEREST_RATE:
@@ -221,17 +228,18 @@ class SimmChallengerModel:
             
             # Calculate weighted sensitivity
             cr = cr_factors.get(bucket, 1.0)
-            ws_key = f"{sens.bucket}_{sens.tenor or 'all'}"
-            ws[ws_key] = rw * sens.delta * cr
+            ws_k = rw * delta * cr
+            ws[f"{bucket}_{sens.tenor or 'all'}"] = ws_k
             
-            self.calculation_log.append({
-                'step': 'WS_calculation',
-                'bucket': bucket,
-                'rw': rw,
-                'sens': sens.delta,
-                'cr': cr,
-                'ws': ws[ws_key]
-            })
+            if log_append is not None:
+                log_append({
+                    'step': 'WS_calculation',
+                    'bucket': bucket,
+                    'rw': rw,
+                    'sens': delta,
+                    'cr': cr,
+                    'ws': ws_k
+                })
         
         return ws
     
@@ -249,24 +257,24 @@ class SimmChallengerModel:
         if not ws_values:
             return 0.0
         
-        # Sum of squares
-        sum_sq = sum(w ** 2 for w in ws_values)
+        # Sum of squares (fsum keeps the closed-form cross terms below from losing precision)
+        sum_sq = math.fsum(w * w for w in ws_values)
         
         # Cross terms (simplified - assumes uniform correlation)
-        cross_terms = 0.0
-        for i, w1 in enumerate(ws_values):
-            for j, w2 in enumerate(ws_values):
-                if i != j:
-                    cross_terms += correlation * w1 * w2
+        # With a single rho the pairwise sum collapses to a closed form, O(n) not O(n^2):
+        # sum_{k != l} rho * WS_k * WS_l = rho * ((sum_k WS_k)^2 - sum_k WS_k^2)
+        sum_ws = math.fsum(ws_values)
+        cross_terms = correlation * (sum_ws * sum_ws - sum_sq)
         
         k = math.sqrt(sum_sq + cross_terms)
         
-        self.calculation_log.append({
-            'step': 'K_calculation',
-            'sum_sq': sum_sq,
-            'cross_terms': cross_terms,
-            'K': k
-        })
+        if self.keep_log:
+            self.calculation_log.append({
+                'step': 'K_calculation',
+                'sum_sq': sum_sq,
+                'cross_terms': cross_terms,
+                'K': k
+            })
         
         return k
     
@@ -278,13 +286,10 @@ class SimmChallengerModel:
             (total_margin, detailed_breakdown)
         """
         # Group sensitivities by risk class
-        by_risk_class = {}
+        by_risk_class = defaultdict(list)
         for sens in sensitivities:
-            if sens.risk_class not in by_risk_class:
-                by_risk_class[sens.risk_class] = []
             by_risk_class[sens.risk_class].append(sens)
         
-        total_margin = 0.0
         breakdown = {}
         
         for risk_class, class_sens in by_risk_class.items():
@@ -294,12 +299,12 @@ class SimmChallengerModel:
             # Calculate K for this risk class
             k = self.calculate_k(ws, risk_class)
             
-            total_margin += k
             breakdown[risk_class] = {
                 'K': k,
                 'WS': ws
             }
         
+        total_margin = math.fsum(entry['K'] for entry in breakdown.values())
         return total_margin, breakdown
     
     def calculate_vega_margin(self, sensitivities: List[Sensitivity]) -> float:
@@ -385,11 +390,11 @@ class SimmChallengerModel:
         curvature_margin = self.calculate_curvature_margin(sensitivities)
         
         # Total margin (simplified - no diversification benefit between risk types)
-        total_margin = math.sqrt(
-            delta_margin**2 + 
-            vega_margin**2 + 
-            curvature_margin**2
-        )
+        total_margin = math.sqrt(math.fsum((
+            delta_margin * delta_margin,
+            vega_margin * vega_margin,
+            curvature_margin * curvature_margin
+        )))
         
         # Build result
         result = SimmResult(
@@ -16,6 +16,8 @@ Author: SIMM Validation Team
 """
 
 import math
+from collections import Counter
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
@@ -108,10 +110,11 @@ class ValidationReport:
             self.fallback_recommended = True
     
     def get_summary(self) -> Dict:
-        passed = sum(1 for c in self.checks if c.status == ValidationStatus.PASS)
-        failed = sum(1 for c in self.checks if c.status == ValidationStatus.FAIL)
-        warnings = sum(1 for c in self.checks if c.status == ValidationStatus.WARNING)
-        circuit_breakers = sum(1 for c in self.checks if c.status == ValidationStatus.CIRCUIT_BREAKER)
+        status_counts = Counter(c.status for c in self.checks)
+        passed = status_counts[ValidationStatus.PASS]
+        failed = status_counts[ValidationStatus.FAIL]
+        warnings = status_counts[ValidationStatus.WARNING]
+        circuit_breakers = status_counts[ValidationStatus.CIRCUIT_BREAKER]
         
         return {
             'trade_id': self.trade_id,
@@ -592,14 +595,35 @@ class SimmValidationEngine:
     # MAIN VALIDATION ENTRY POINT
     # =============================================================================
     
+    # Tier routing rules, first match wins:
+    # (product_type keywords, excluded keywords, check method names to run).
+    # Names are resolved on the instance so subclass overrides are honoured.
+    TIER_ROUTES = [
+        # Tier 1: Linear Products
+        (('FORWARD', 'SWAP', 'NDF', 'IRS'), (), ('validate_linear_product',)),
+        # Tier 2: Vanilla Options
+        (('VANILLA', 'OPTION'), ('EXOTIC',), ('validate_vanilla_option',)),
+        # Tier 4: Exotics (base checks plus circuit breakers)
+        (('BARRIER', 'DIGITAL', 'TARF', 'TOUCH'), (),
+         ('validate_vanilla_option', 'check_exotic_circuit_breakers')),
+    ]
+    
+    # Default: Basic checks only
+    DEFAULT_ROUTE = ('validate_linear_product',)
+    
+    # Overall status precedence, most severe first
+    STATUS_PRECEDENCE = (
+        ValidationStatus.CIRCUIT_BREAKER,
+        ValidationStatus.FAIL,
+        ValidationStatus.WARNING
+    )
+    
     def validate(self, sp_output: SpSimmOutput) -> ValidationReport:
         """
         Main validation entry point
         
         Routes to appropriate validation tier based on product type.
         """
-        from datetime import datetime
-        
         report = ValidationReport(
             trade_id=sp_output.trade_id,
             validation_date=datetime.now().isoformat(),
@@ -608,39 +632,42 @@ class SimmValidationEngine:
         
         # Route to appropriate tier
         product = sp_output.product_type.upper()
+        route = self.DEFAULT_ROUTE
+        for keywords, excluded, methods in self.TIER_ROUTES:
+            if any(x in product for x in keywords) and not any(x in product for x in excluded):
+                route = methods
+                break
         
-        if any(x in product for x in ['FORWARD', 'SWAP', 'NDF', 'IRS']):
-            # Tier 1: Linear Products
-            checks = self.validate_linear_product(sp_output)
-        
-        elif any(x in product for x in ['VANILLA', 'OPTION']) and 'EXOTIC' not in product:
-            # Tier 2: Vanilla Options
-            checks = self.validate_vanilla_option(sp_output)
-        
-        elif any(x in product for x in ['BARRIER', 'DIGITAL', 'TARF', 'TOUCH']):
-            # Tier 4: Exotics (with circuit breakers)
-            checks = self.validate_vanilla_option(sp_output)  # Base checks
-            checks.extend(self.check_exotic_circuit_breakers(sp_output))  # Circuit breakers
-        
-        else:
-            # Default: Basic checks only
-            checks = self.validate_linear_product(sp_output)
+        checks = []
+        for method in route:
+            checks.extend(getattr(self, method)(sp_output))
         
         # Add all checks to report
         for check in checks:
             report.add_check(check)
         
-        # Determine overall status
-        if any(c.status == ValidationStatus.CIRCUIT_BREAKER for c in checks):
-            report.overall_status = ValidationStatus.CIRCUIT_BREAKER
-        elif any(c.status == ValidationStatus.FAIL for c in checks):
-            report.overall_status = ValidationStatus.FAIL
-        elif any(c.status == ValidationStatus.WARNING for c in checks):
-            report.overall_status = ValidationStatus.WARNING
+        # Determine overall status from a single pass over the check statuses
+        statuses = {c.status for c in checks}
+        for status in self.STATUS_PRECEDENCE:
+            if status in statuses:
+                report.overall_status = status
+                break
         
         return report
 
 
+def _check_routes(engine_cls: type) -> None:
+    """Fail at import, not on the first trade of a tier, if a route names a missing check"""
+    routes = [methods for _, _, methods in engine_cls.TIER_ROUTES] + [engine_cls.DEFAULT_ROUTE]
+    for methods in routes:
+        for method in methods:
+            if not callable(getattr(engine_cls, method, None)):
+                raise AttributeError(f"{engine_cls.__name__} route names unknown check {method!r}")
+
+
+_check_routes(SimmValidationEngine)
+
+
 # =============================================================================
 # EXAMPLE USAGE
 # =============================================================================
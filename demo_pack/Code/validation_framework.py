@@ -17,6 +17,7 @@ Author: SIMM Validation Team
 
 import json
 import math
+from collections import Counter
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
@@ -69,9 +70,10 @@ class TradeValidationReport:
         self.results.append(result)
     
     def get_summary(self) -> Dict:
-        passed = sum(1 for r in self.results if r.status == ValidationStatus.PASS)
-        failed = sum(1 for r in self.results if r.status == ValidationStatus.FAIL)
-        warnings = sum(1 for r in self.results if r.status == ValidationStatus.WARNING)
+        status_counts = Counter(r.status for r in self.results)
+        passed = status_counts[ValidationStatus.PASS]
+        failed = status_counts[ValidationStatus.FAIL]
+        warnings = status_counts[ValidationStatus.WARNING]
         
         return {
             'trade_id': self.trade_id,
@@ -94,6 +96,16 @@ class TradeValidationReport:
         }
 
 
+def _variance_pct(sp_value: float, challenger_value: float) -> float:
+    """Percentage variance of the Challenger value against the S&P value"""
+    # Exact matches are the common reconciliation outcome: skip the division
+    if challenger_value == sp_value:
+        return 0.0
+    if abs(sp_value) < 1e-6:
+        return 0 if abs(challenger_value) < 1e-6 else float('inf')
+    return ((challenger_value - sp_value) / sp_value) * 100
+
+
 class SimmReconciliationEngine:
     """
     Reconciliation engine for comparing S&P SIMM vs Challenger Model
@@ -121,10 +133,7 @@ class SimmReconciliationEngine:
         """
         tolerance = tolerance_pct or self.default_tolerance_pct
         
-        if abs(sp_margin) < 1e-6:
-            variance_pct = 0 if abs(challenger_margin) < 1e-6 else float('inf')
-        else:
-            variance_pct = ((challenger_margin - sp_margin) / sp_margin) * 100
+        variance_pct = _variance_pct(sp_margin, challenger_margin)
         
         variance = challenger_margin - sp_margin
         
@@ -164,10 +173,7 @@ class SimmReconciliationEngine:
         """
         tolerance = tolerance_pct or self.default_tolerance_pct
         
-        if abs(sp_value) < 1e-6:
-            variance_pct = 0 if abs(challenger_value) < 1e-6 else float('inf')
-        else:
-            variance_pct = ((challenger_value - sp_value) / sp_value) * 100
+        variance_pct = _variance_pct(sp_value, challenger_value)
         
         variance = challenger_value - sp_value
         
@@ -210,10 +216,7 @@ class SimmReconciliationEngine:
             sp_val = sp_sensitivities.get(key, 0.0)
             ch_val = challenger_sensitivities.get(key, 0.0)
             
-            if abs(sp_val) < 1e-6:
-                variance_pct = 0 if abs(ch_val) < 1e-6 else float('inf')
-            else:
-                variance_pct = ((ch_val - sp_val) / sp_val) * 100
+            variance_pct = _variance_pct(sp_val, ch_val)
             
             variance = ch_val - sp_val
             
@@ -311,19 +314,12 @@ class ValidationReportGenerator:
     
     def _generate_summary(self) -> Dict:
         """Generate overall summary statistics"""
-        total_checks = sum(len(r.results) for r in self.reports)
-        total_passed = sum(
-            sum(1 for res in r.results if res.status == ValidationStatus.PASS)
-            for r in self.reports
-        )
-        total_failed = sum(
-            sum(1 for res in r.results if res.status == ValidationStatus.FAIL)
-            for r in self.reports
-        )
-        total_warnings = sum(
-            sum(1 for res in r.results if res.status == ValidationStatus.WARNING)
-            for r in self.reports
-        )
+        # Single pass over all results instead of one pass per status
+        status_counts = Counter(res.status for r in self.reports for res in r.results)
+        total_checks = sum(status_counts.values())
+        total_passed = status_counts[ValidationStatus.PASS]
+        total_failed = status_counts[ValidationStatus.FAIL]
+        total_warnings = status_counts[ValidationStatus.WARNING]
         
         pass_rate = (total_passed / total_checks * 100) if total_checks > 0 else 0
         
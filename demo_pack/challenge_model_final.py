@@ -11,7 +11,8 @@ Author: SIMM Challenger Team
 """
 
 import math
-from typing import Dict, Optional, Union, Literal
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple, Union, Literal
 from dataclasses import dataclass, field
 from enum import Enum, auto
 
@@ -114,6 +115,27 @@ IR_RW = {
 
 CRQ_THRESHOLD = 0.55
 
+# Pin-risk proximity thresholds by barrier type (Section 11a circuit breaker)
+BARRIER_PIN_THRESHOLD_DEFAULT = 0.02     # 2% for regular barriers
+BARRIER_PIN_THRESHOLDS = {
+    BarrierType.RKO: 0.03,               # 3% for reverse barriers
+    BarrierType.RKI: 0.03,
+    BarrierType.KIKO: 0.025,             # 2.5% for double barriers
+}
+
+# TARF schedule floor factors indexed by (has_eki << 2) | (is_digital_tarf << 1) | is_pivot.
+# EKI takes precedence over Digital, which takes precedence over Pivot.
+TARF_FLOOR_FACTORS = (
+    0.10,  # Standard TARF without EKI
+    0.16,  # Pivot TARF
+    0.18,  # Digital TARF highest floor
+    0.18,
+    0.15,  # TARF with EKI has higher floor
+    0.15,
+    0.15,
+    0.15,
+)
+
 # Product Classifications based on SPEC_EN and Excel requirements
 EXEMPT_PRODUCTS = ['FX_CASH', 'SPOT_FX']
 
@@ -142,15 +164,44 @@ COMPLEX_PRODUCTS = [
 ]
 
 
+# Bounded: direct challenger calls may pass arbitrary product_type strings
+@lru_cache(maxsize=128)
+def family_traits(product_type: str) -> Tuple[bool, bool, bool]:
+    """Intern a product_type into its (is_fx, is_tarf, is_eki) family booleans
+    
+    The substring scans run once per product type instead of once per trade.
+    """
+    return (
+        'FX' in product_type or 'CROSS_CURRENCY' in product_type,
+        'TARF' in product_type,
+        'EKI' in product_type,
+    )
+
+
 def scaling_function(t_days: float) -> float:
-    """SIMM 2.8 Section 11, Eq. 11.2"""
-    return 0.5 * min(1.0, 14.0 / max(t_days, 1.0))
+    """SIMM 2.8 Section 11, Eq. 11.2: SF(t) = 0.5 * min(1, 14/t)"""
+    # Closed form: flat 0.5 up to the 14-day floor, 7/t beyond it
+    if t_days > 14.0:
+        return 7.0 / t_days
+    return 0.5
+
+
+def barrier_proximity(spot: float, barrier: float) -> float:
+    """Relative distance of spot from a barrier level"""
+    return abs(spot - barrier) / barrier
+
+
+def gamma_curvature(gamma: float, spot: float, sigma: float, t_days: float) -> float:
+    """Gamma-implied curvature: 0.5 * Gamma * S^2 * sigma^2 * min(1, 14/t)"""
+    time_factor = min(1.0, 14.0 / t_days)
+    return 0.5 * gamma * (spot * spot) * (sigma * sigma) * time_factor
 
 
 class OutOfScopeValidator:
     """Tier 0: FX Cash exemption (Section 3)"""
     
-    def challenge(self, trade: Trade, primary: SimmResult) -> ChallengeResult:
+    @classmethod
+    def challenge(cls, trade: Trade, primary: SimmResult) -> ChallengeResult:
         if trade.product_type in EXEMPT_PRODUCTS:
             if trade.trade_date == trade.value_date:
                 return ChallengeResult(
@@ -164,7 +215,8 @@ class OutOfScopeValidator:
 class LinearProductChallenge:
     """Tier 1: Linear products validation (Section 7 & 12)"""
     
-    def challenge(self, trade: Trade, primary: SimmResult) -> ChallengeResult:
+    @classmethod
+    def challenge(cls, trade: Trade, primary: SimmResult) -> ChallengeResult:
         delta_sens = trade.sensitivities.get('delta', {})
         if not delta_sens:
             return ChallengeResult(
@@ -173,22 +225,21 @@ class LinearProductChallenge:
                 recommendation="CHECK_INPUT_DATA"
             )
         
-        sum_abs_sens = sum(abs(v) for v in delta_sens.values())
+        sum_abs_sens = sum(map(abs, delta_sens.values()))
         
-        if 'FX' in trade.product_type or 'CROSS_CURRENCY' in trade.product_type:
+        is_fx, _, _ = family_traits(trade.product_type)
+        if is_fx:
             rw = FX_RW_G10
             threshold = FX_THRESHOLD
         else:
             rw = IR_RW.get('5Y', 0.0441)
             threshold = 35e9
         
-        cr = max(1.0, math.sqrt(sum_abs_sens / threshold)) if sum_abs_sens > 0 else 1.0
-        theoretical_max = sum_abs_sens * rw * cr
-        
-        # ARR features check
-        if trade.arr_features:
-            arr_adjustment = 1.02  # 2% adjustment for ARR complexity
-            theoretical_max *= arr_adjustment
+        # CR = max(1, sqrt(S/T)) only rises above 1 once S exceeds the threshold
+        cr = math.sqrt(sum_abs_sens / threshold) if sum_abs_sens > threshold else 1.0
+        # ARR features carry a 2% adjustment for ARR complexity
+        arr_adjustment = 1.02 if trade.arr_features else 1.0
+        theoretical_max = sum_abs_sens * rw * cr * arr_adjustment
         
         if primary.margin > theoretical_max * 1.05:
             return ChallengeResult(
@@ -208,16 +259,14 @@ class LinearProductChallenge:
 class VanillaOptionChallenge:
     """Tier 2: Vanilla option validation (Section 11)"""
     
-    def challenge(self, trade: Trade, primary: SimmResult) -> ChallengeResult:
-        vega = trade.sensitivities.get('vega', 0)
-        gamma = trade.sensitivities.get('gamma', 0)
-        sigma = trade.sensitivities.get('implied_vol', 0.2)
-        t_days = trade.days_to_expiry or 30
-        
+    @classmethod
+    def challenge(cls, trade: Trade, primary: SimmResult) -> ChallengeResult:
         # Time Option specific validation
         if trade.is_time_option:
-            return self._challenge_time_option(trade, primary)
+            return cls._challenge_time_option(trade, primary)
         
+        # Each stage of the waterfall reads only the inputs it needs
+        vega = trade.sensitivities.get('vega', 0)
         if vega == 0:
             return ChallengeResult(
                 status="WARNING",
@@ -237,7 +286,7 @@ class VanillaOptionChallenge:
         
         # Barrier direction check for barrier vanilla options
         if trade.barrier_direction:
-            return self._challenge_barrier_vanilla(trade, primary)
+            return cls._challenge_barrier_vanilla(trade, primary)
         
         # Payout type check
         if trade.payout_type == PayoutType.FOREIGN:
@@ -251,15 +300,15 @@ class VanillaOptionChallenge:
                 )
         
         # Vega-Gamma consistency
-        sf = scaling_function(t_days)
-        cvr_simm = sf * sigma * vega
-        
-        s = trade.underlying_spot or trade.strike or 100.0
+        gamma = trade.sensitivities.get('gamma', 0)
         if gamma != 0:
-            time_factor = min(1.0, 14.0 / t_days)
-            cvr_gamma = 0.5 * gamma * (s ** 2) * (sigma ** 2) * time_factor
+            sigma = trade.sensitivities.get('implied_vol', 0.2)
+            t_days = trade.days_to_expiry or 30
+            s = trade.underlying_spot or trade.strike or 100.0
+            cvr_gamma = gamma_curvature(gamma, s, sigma, t_days)
             
             if cvr_gamma > 0:
+                cvr_simm = scaling_function(t_days) * sigma * vega
                 ratio = cvr_simm / cvr_gamma
                 if not (0.3 <= ratio <= 3.0):
                     return ChallengeResult(
@@ -275,7 +324,8 @@ class VanillaOptionChallenge:
             primary_margin=primary.margin
         )
     
-    def _challenge_time_option(self, trade: Trade, primary: SimmResult) -> ChallengeResult:
+    @classmethod
+    def _challenge_time_option(cls, trade: Trade, primary: SimmResult) -> ChallengeResult:
         """Validate Time Option (Option Dated Forward)"""
         # Time option behaves like a forward with optionality on fixing date
         delta = trade.sensitivities.get('delta', 0)
@@ -293,9 +343,10 @@ class VanillaOptionChallenge:
             primary_margin=primary.margin
         )
     
-    def _challenge_barrier_vanilla(self, trade: Trade, primary: SimmResult) -> ChallengeResult:
+    @classmethod
+    def _challenge_barrier_vanilla(cls, trade: Trade, primary: SimmResult) -> ChallengeResult:
         """Validate vanilla options with barrier features"""
-        barrier_dist = abs(trade.underlying_spot - trade.strike) / trade.strike
+        barrier_dist = barrier_proximity(trade.underlying_spot, trade.strike)
         
         if trade.barrier_direction in [BarrierDirection.UP_AND_IN, BarrierDirection.DOWN_AND_IN]:
             # Knock-in: barrier must be crossed for option to activate
@@ -325,7 +376,8 @@ class VanillaOptionChallenge:
 class CreditProductChallenge:
     """Tier 3: Credit products validation (Section 8 & 9)"""
     
-    def challenge(self, trade: Trade, primary: SimmResult) -> ChallengeResult:
+    @classmethod
+    def challenge(cls, trade: Trade, primary: SimmResult) -> ChallengeResult:
         qualifying = ['AAA', 'AA', 'A', 'BBB', 'BBB+', 'BBB-']
         is_qualifying = trade.credit_rating in qualifying if trade.credit_rating else False
         
@@ -353,7 +405,8 @@ class CreditProductChallenge:
 class ExoticCircuitBreaker:
     """Tier 4: Exotic products circuit breakers (Section 11a)"""
     
-    def challenge(self, trade: Trade, primary: SimmResult) -> ChallengeResult:
+    @classmethod
+    def challenge(cls, trade: Trade, primary: SimmResult) -> ChallengeResult:
         # Circuit Breaker 1: CVR too high
         cvr = primary.curvature_risk
         if cvr > trade.notional * 0.50:
@@ -366,15 +419,10 @@ class ExoticCircuitBreaker:
         
         # Circuit Breaker 2: Near barrier with barrier type specifics
         if trade.barrier_level and trade.underlying_spot:
-            prox = abs(trade.underlying_spot - trade.barrier_level) / trade.barrier_level
+            prox = barrier_proximity(trade.underlying_spot, trade.barrier_level)
             
-            # Reverse barrier (RKO/RKI) has higher pin risk
-            if trade.barrier_type in [BarrierType.RKO, BarrierType.RKI]:
-                threshold = 0.03  # 3% for reverse barriers
-            elif trade.barrier_type == BarrierType.KIKO:
-                threshold = 0.025  # 2.5% for double barriers
-            else:
-                threshold = 0.02  # 2% for regular barriers
+            # Reverse (RKO/RKI) and double (KIKO) barriers have higher pin risk
+            threshold = BARRIER_PIN_THRESHOLDS.get(trade.barrier_type, BARRIER_PIN_THRESHOLD_DEFAULT)
             
             if prox < threshold:
                 barrier_type_str = trade.barrier_type.name if trade.barrier_type else "Standard"
@@ -390,8 +438,8 @@ class ExoticCircuitBreaker:
             # Digital Range Option has dual discontinuity
             if trade.product_type == 'DIGITAL_RANGE':
                 if trade.lower_barrier and trade.upper_barrier:
-                    prox_lower = abs(trade.underlying_spot - trade.lower_barrier) / trade.lower_barrier
-                    prox_upper = abs(trade.underlying_spot - trade.upper_barrier) / trade.upper_barrier
+                    prox_lower = barrier_proximity(trade.underlying_spot, trade.lower_barrier)
+                    prox_upper = barrier_proximity(trade.underlying_spot, trade.upper_barrier)
                     if prox_lower < 0.01 or prox_upper < 0.01:
                         return ChallengeResult(
                             status="MANDATORY_FALLBACK",
@@ -425,28 +473,25 @@ class ExoticCircuitBreaker:
 class ConservativeFloorEnforcer:
     """Tier 4: Complex structures floor enforcement with EKI distinction"""
     
-    def _schedule_margin(self, trade: Trade) -> float:
+    @staticmethod
+    def _schedule_margin(trade: Trade, is_tarf: bool, has_eki: bool) -> float:
         """Calculate schedule-based margin with EKI distinction"""
         base_factor = 0.10
         
-        if 'TARF' in trade.product_type:
-            # TARF with EKI has higher floor
-            if trade.has_eki or 'EKI' in trade.product_type:
-                base_factor = 0.15
-            elif trade.is_digital_tarf:
-                base_factor = 0.18  # Digital TARF highest floor
-            elif trade.is_pivot:
-                base_factor = 0.16  # Pivot TARF
-            else:
-                base_factor = 0.10  # Standard TARF without EKI
+        if is_tarf:
+            key = (4 if has_eki else 0) | (2 if trade.is_digital_tarf else 0) | (1 if trade.is_pivot else 0)
+            base_factor = TARF_FLOOR_FACTORS[key]
         
         return trade.notional * base_factor
     
-    def challenge(self, trade: Trade, primary: SimmResult) -> ChallengeResult:
-        floor = self._schedule_margin(trade)
+    @classmethod
+    def challenge(cls, trade: Trade, primary: SimmResult) -> ChallengeResult:
+        _, is_tarf, eki_named = family_traits(trade.product_type)
+        has_eki = trade.has_eki or eki_named
+        floor = cls._schedule_margin(trade, is_tarf, has_eki)
         
         if primary.margin < floor * 0.8:
-            eki_status = "with EKI" if (trade.has_eki or 'EKI' in trade.product_type) else "without EKI"
+            eki_status = "with EKI" if has_eki else "without EKI"
             return ChallengeResult(
                 status="CHALLENGE_FAILED",
                 reason=f"Margin below conservative floor ({eki_status})",
@@ -456,14 +501,14 @@ class ConservativeFloorEnforcer:
             )
         
         # TARF path dependency check with EKI consideration
-        if 'TARF' in trade.product_type and trade.target > 0:
+        if is_tarf and trade.target > 0:
             completion = trade.accumulated_gain / trade.target
             
             # For TARF with EKI, allow higher vega near completion
-            vega_threshold = 0.7 if (trade.has_eki or 'EKI' in trade.product_type) else 0.5
+            vega_threshold = 0.7 if has_eki else 0.5
             
             if completion > 0.8 and primary.vega_risk > primary.delta_risk * vega_threshold:
-                eki_note = " (EKI active)" if (trade.has_eki or 'EKI' in trade.product_type) else ""
+                eki_note = " (EKI active)" if has_eki else ""
                 return ChallengeResult(
                     status="WARNING",
                     reason=f"TARF {completion:.0%} complete but high vega{eki_note}",
@@ -547,8 +592,61 @@ class SIMM28ChallengeHub:
                 primary_margin=primary.margin
             )
         
-        challenger = challenge_class()
-        return challenger.challenge(trade, primary)
+        # Challengers are stateless: call the classmethod without instantiating
+        return challenge_class.challenge(trade, primary)
+    
+    def challenge_batch(self, trades: List[Trade], primaries: List[SimmResult]) -> List[ChallengeResult]:
+        """Execute challenges for a book of trades, one product type at a time
+        
+        Trades are grouped by product type so each challenger is resolved once
+        and runs over its whole block; results come back in input order.
+        """
+        if len(trades) != len(primaries):
+            raise ValueError(f"Got {len(trades)} trades but {len(primaries)} primary results")
+        
+        by_product: Dict[str, List[int]] = {}
+        for i, trade in enumerate(trades):
+            by_product.setdefault(trade.product_type, []).append(i)
+        
+        results: List[Optional[ChallengeResult]] = [None] * len(trades)
+        for product_type, block in by_product.items():
+            challenge_class = self.REGISTRY.get(product_type)
+            if not challenge_class:
+                # challenge() owns the UNKNOWN_PRODUCT result
+                for i in block:
+                    results[i] = self.challenge(trades[i], primaries[i])
+                continue
+            
+            challenge = challenge_class.challenge
+            for i in block:
+                results[i] = challenge(trades[i], primaries[i])
+        
+        return results
+    
+    def specialize(self, expected_mix: Dict[str, float]) -> Callable[[Trade, SimmResult], ChallengeResult]:
+        """Build a challenge function specialised for a book's product mix
+        
+        The challenger for the dominant product type in expected_mix (product
+        type -> weight) is bound up front, so trades of that type skip the
+        registry lookup; every other trade goes through challenge().
+        """
+        generic = self.challenge
+        if not expected_mix:
+            return generic
+        
+        dominant = max(expected_mix, key=expected_mix.get)
+        challenge_class = self.REGISTRY.get(dominant)
+        if not challenge_class:
+            return generic
+        
+        fast_path = challenge_class.challenge
+        
+        def specialized(trade: Trade, primary: SimmResult) -> ChallengeResult:
+            if trade.product_type == dominant:
+                return fast_path(trade, primary)
+            return generic(trade, primary)
+        
+        return specialized
     
     def get_tier(self, product_type: str) -> ProductTier:
         """Get risk tier for product"""